@@ -1,6 +1,56 @@
 import re
+import array
+from enum import IntEnum
 import random
+import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
+from matplotlib.lines import Line2D
+from matplotlib.ticker import MaxNLocator
+from numba import njit
+
+KEYWORD_SPECS = [
+    ("PLACE", "Постав", ("ити", "лено", "те")),
+    ("POINT", "точк", ("у", "а", "ою", "и")),
+    ("BUILD", "Побуд", ("увати", "уйте", "ова")),
+    ("RECTANGLE", "прямокутн", ("ик", "ика", "ику", "иком", "и")),
+    ("TRIANGLE", "трикутн", ("ик", "ика", "ику", "иком", "и")),
+    ("CONNECT", "Пров", ("ести", "едено")),
+    ("LINE", "відріз", ("ок", "ка", "ку", "ком", "ки")),
+]
+
+TOKEN_SPECS = [
+    ("WORD", r"\b[А-Яа-яІіЇїЄєҐґ]+\b"),
+    ("ID", r"[A-Z]"),
+    ("LPAREN", r"\("),
+    ("RPAREN", r"\)"),
+    ("COMMA", r","),
+    ("NUMBER", r"-?\d+(?:\.\d+)?"),
+    ("DOT", r"\."),
+]
+
+TOKEN_PATTERN = re.compile(
+    "|".join(f"(?P<{name}>{pattern})" for name, pattern in TOKEN_SPECS)
+)
+
+TokenType = IntEnum(
+    "TokenType",
+    [name for name, _, _ in KEYWORD_SPECS]
+    + [name for name, _ in TOKEN_SPECS if name != "WORD"],
+    start=0,
+)
+
+# Enumerating the full inflected forms keeps keyword recognition a
+# single exact hash probe per word span found by the scanner.
+KEYWORDS = {
+    stem + suffix: TokenType[name]
+    for name, stem, suffixes in KEYWORD_SPECS
+    for suffix in suffixes
+}
+
+GROUP_TYPES = {
+    name: TokenType[name] for name, _ in TOKEN_SPECS if name != "WORD"
+}
 
 
 class Lexer:
@@ -10,202 +60,239 @@ class Lexer:
         self.current_pos = 0
 
     def tokenize(self):
-        patterns = [
-            (r"\bПостав(ити|лено|те)\b", "PLACE"),
-            (r"\bточк(у|а|ою|и)\b", "POINT"),
-            (r"\b(Побуд(увати|уйте|ова))\b", "BUILD"),
-            (r"\bпрямокутн(ик|ика|ику|иком|и)\b", "RECTANGLE"),
-            (r"\bтрикутн(ик|ика|ику|иком|и)\b", "TRIANGLE"),
-            (r"\bПров(ести|едено)\b", "CONNECT"),
-            (r"\bвідріз(ок|ка|ку|ком|ки)\b", "LINE"),
-            (r"[A-Z]", "ID"),
-            (r"\(", "LPAREN"),
-            (r"\)", "RPAREN"),
-            (r",", "COMMA"),
-            (r"-?\d+(\.\d+)?", "NUMBER"),
-            (r"\.", "DOT"),
+        # A single finditer pass yields matches in source order, so no
+        # sort (or merge of per-pattern streams) is needed. Words that
+        # are not keywords classify to None and are filtered out.
+        self.tokens = [
+            (token_type, match.group())
+            for match in TOKEN_PATTERN.finditer(self.text)
+            if (token_type := KEYWORDS.get(match.group())
+                if match.lastgroup == "WORD"
+                else GROUP_TYPES[match.lastgroup]) is not None
         ]
+        return self.tokens
 
-        for pattern, token_type in patterns:
-            for match in re.finditer(pattern, self.text):
-                self.tokens.append((token_type, match.group(), match.start()))
 
-        self.tokens.sort(key=lambda x: x[2])
-
-        return [(token_type, value) for token_type, value, _ in self.tokens]
+@njit(cache=True)
+def _collinear(x1, y1, x2, y2, x3, y3):
+    return abs(x1 * (y2 - y3) + x2 * (y3 - y1) + x3 * (y1 - y2)) < 1e-12
 
 
 class Node:
-    pass
+    __slots__ = ()
 
 
 class PointNode(Node):
-    def __init__(self, name, x, y):
+    __slots__ = ('name', 'index')
+
+    def __init__(self, name, index):
         self.name = name
-        self.x = float(x)
-        self.y = float(y)
+        self.index = index
 
     def __repr__(self):
-        return f"Point({self.name}, {self.x}, {self.y})"
+        return f"Point({self.name}, #{self.index})"
 
 
 class RectangleNode(Node):
+    __slots__ = ('points',)
+
     def __init__(self, points):
-        self.points = points
+        self.points = np.asarray(points, dtype=np.int32)
 
     def __repr__(self):
-        return f"Rectangle({self.points})"
+        return f"Rectangle({self.points.tolist()})"
 
 
 class TriangleNode(Node):
+    __slots__ = ('points',)
+
     def __init__(self, points):
-        self.points = points
+        self.points = np.asarray(points, dtype=np.int32)
 
     def __repr__(self):
-        return f"Triangle({self.points})"
+        return f"Triangle({self.points.tolist()})"
 
 
 class LineNode(Node):
+    __slots__ = ('point1', 'point2')
+
     def __init__(self, point1, point2):
         self.point1 = point1
         self.point2 = point2
 
     def __repr__(self):
-        return f"Line({self.point1}, {self.point2})"
+        return f"Line(#{self.point1}, #{self.point2})"
 
 
 class Parser:
     def __init__(self, tokens):
         self.tokens = tokens
+        self.types = array.array('b', [t for t, _ in tokens])
         self.pos = 0
+        self.coords = []
         self.built_points = {}
 
     def consume(self, token_type):
-        if self.pos < len(self.tokens) and self.tokens[self.pos][0] == token_type:
+        if self.pos < len(self.tokens) and self.types[self.pos] == token_type:
             value = self.tokens[self.pos][1]
             self.pos += 1
             return value
         raise SyntaxError(
-            f"Expected {token_type}, got {self.tokens[self.pos][0]} at position {self.pos}"
+            f"Expected {token_type.name}, got {TokenType(self.types[self.pos]).name} at position {self.pos}"
         )
 
     def random_coordinates(self):
         """Generate random coordinates between -10 and 10."""
         return random.uniform(-10, 10), random.uniform(-10, 10)
 
-    def check_collinearity(self, p1, p2, p3):
+    def check_collinearity(self, i1, i2, i3):
         """Check if three points are collinear using the area formula."""
-        return abs(p1.x * (p2.y - p3.y) + p2.x * (p3.y - p1.y) + p3.x * (p1.y - p2.y)) == 0
+        x1, y1 = self.coords[i1]
+        x2, y2 = self.coords[i2]
+        x3, y3 = self.coords[i3]
+        return _collinear(x1, y1, x2, y2, x3, y3)
 
     def parse_points(self):
-        self.consume("PLACE")
+        self.consume(TokenType.PLACE)
         points = []
-        while self.pos < len(self.tokens) and self.tokens[self.pos][0] == "POINT":
-            self.consume("POINT")
-            name = self.consume("ID")
-
-            while self.pos < len(self.tokens) and self.tokens[self.pos][0] == "DOT":
-                self.consume("DOT")
-
-            if self.pos < len(self.tokens) and self.tokens[self.pos][0] == "LPAREN":
-                self.consume("LPAREN")
-                x = self.consume("NUMBER")
-                self.consume("COMMA")
-                y = self.consume("NUMBER")
-                self.consume("RPAREN")
+        types = self.types
+        n = len(types)
+        while self.pos < n and types[self.pos] == TokenType.POINT:
+            self.consume(TokenType.POINT)
+            name = self.consume(TokenType.ID)
+
+            while self.pos < n and types[self.pos] == TokenType.DOT:
+                self.consume(TokenType.DOT)
+
+            if self.pos < n and types[self.pos] == TokenType.LPAREN:
+                self.consume(TokenType.LPAREN)
+                x = self.consume(TokenType.NUMBER)
+                self.consume(TokenType.COMMA)
+                y = self.consume(TokenType.NUMBER)
+                self.consume(TokenType.RPAREN)
             else:
                 x, y = self.random_coordinates()
 
-            point = PointNode(name, x, y)
-            self.built_points[name] = point
+            index = len(self.coords)
+            self.coords.append((float(x), float(y)))
+            point = PointNode(name, index)
+            self.built_points[name] = index
             points.append(point)
 
-            if self.pos < len(self.tokens) and self.tokens[self.pos][0] == "DOT":
-                self.consume("DOT")
+            if self.pos < n and types[self.pos] == TokenType.DOT:
+                self.consume(TokenType.DOT)
                 break
-            if self.pos < len(self.tokens) and self.tokens[self.pos][0] == "COMMA":
-                self.consume("COMMA")
+            if self.pos < n and types[self.pos] == TokenType.COMMA:
+                self.consume(TokenType.COMMA)
         return points
 
     def parse_rectangle(self):
-        self.consume("BUILD")
-        self.consume("RECTANGLE")
-        points = [self.consume("ID") for _ in range(4)]
-        if any(name not in self.built_points for name in points):
-            raise ValueError(f"One or more points are not defined: {points}")
+        self.consume(TokenType.BUILD)
+        self.consume(TokenType.RECTANGLE)
+        points = [self.consume(TokenType.ID) for _ in range(4)]
+        missing = [name for name in points if name not in self.built_points]
+        if missing:
+            raise ValueError(f"One or more points are not defined: {missing}")
         return RectangleNode([self.built_points[name] for name in points])
 
     def parse_triangle(self):
-        self.consume("BUILD")
-        self.consume("TRIANGLE")
-        points = [self.consume("ID") for _ in range(3)]
-        if any(name not in self.built_points for name in points):
-            raise ValueError(f"One or more points are not defined: {points}")
-
-        p1, p2, p3 = [self.built_points[name] for name in points]
-        if self.check_collinearity(p1, p2, p3):
+        self.consume(TokenType.BUILD)
+        self.consume(TokenType.TRIANGLE)
+        points = [self.consume(TokenType.ID) for _ in range(3)]
+        missing = [name for name in points if name not in self.built_points]
+        if missing:
+            raise ValueError(f"One or more points are not defined: {missing}")
+
+        i1, i2, i3 = [self.built_points[name] for name in points]
+        if self.check_collinearity(i1, i2, i3):
             raise ValueError(f"The points {points} are collinear and cannot form a triangle.")
 
-        return TriangleNode([p1, p2, p3])
+        return TriangleNode([i1, i2, i3])
 
     def parse_line(self):
-        self.consume("CONNECT")
-        self.consume("LINE")
-        point1 = self.consume("ID")
-        self.consume("COMMA")
-        point2 = self.consume("ID")
-        if point1 not in self.built_points or point2 not in self.built_points:
-            raise ValueError(f"One or more points are not defined: {point1}, {point2}")
+        self.consume(TokenType.CONNECT)
+        self.consume(TokenType.LINE)
+        point1 = self.consume(TokenType.ID)
+        self.consume(TokenType.COMMA)
+        point2 = self.consume(TokenType.ID)
+        missing = [name for name in (point1, point2) if name not in self.built_points]
+        if missing:
+            raise ValueError(f"One or more points are not defined: {missing}")
         return LineNode(self.built_points[point1], self.built_points[point2])
 
     def parse(self):
         nodes = []
-        while self.pos < len(self.tokens):
-            token_type = self.tokens[self.pos][0]
+        types = self.types
+        n = len(types)
+        while self.pos < n:
+            token_type = types[self.pos]
 
-            if token_type == "PLACE":
+            if token_type == TokenType.PLACE:
                 nodes.extend(self.parse_points())
-            elif token_type == "BUILD" and self.tokens[self.pos + 1][0] == "RECTANGLE":
+            elif token_type == TokenType.BUILD and types[self.pos + 1] == TokenType.RECTANGLE:
                 nodes.append(self.parse_rectangle())
-            elif token_type == "BUILD" and self.tokens[self.pos + 1][0] == "TRIANGLE":
+            elif token_type == TokenType.BUILD and types[self.pos + 1] == TokenType.TRIANGLE:
                 nodes.append(self.parse_triangle())
-            elif token_type == "CONNECT":
+            elif token_type == TokenType.CONNECT:
                 nodes.append(self.parse_line())
-            elif token_type == "DOT":
-                self.consume("DOT")
+            elif token_type == TokenType.DOT:
+                self.consume(TokenType.DOT)
                 continue
             else:
-                raise SyntaxError(f"Unexpected token: {token_type}")
+                raise SyntaxError(f"Unexpected token: {TokenType(token_type).name}")
 
         return nodes
 
 
-def draw(nodes):
+SHAPE_COLORS = {
+    "Rectangle": "tab:blue",
+    "Triangle": "tab:orange",
+    "Line": "tab:green",
+}
+
+
+def draw(nodes, coords):
+    coords = np.asarray(coords, dtype=np.float64)
+    ax = plt.gca()
+    segments = []
+    colors = []
+    kinds = {}
     for node in nodes:
         if isinstance(node, RectangleNode):
-            points = node.points + [node.points[0]]
-            x = [point.x for point in points]
-            y = [point.y for point in points]
-            plt.plot(x, y, label="Rectangle")
+            kind = "Rectangle"
+            xy = coords[np.append(node.points, node.points[0])]
         elif isinstance(node, TriangleNode):
-            points = node.points + [node.points[0]]
-            x = [point.x for point in points]
-            y = [point.y for point in points]
-            plt.plot(x, y, label="Triangle")
+            kind = "Triangle"
+            xy = coords[np.append(node.points, node.points[0])]
         elif isinstance(node, LineNode):
-            x = [node.point1.x, node.point2.x]
-            y = [node.point1.y, node.point2.y]
-            plt.plot(x, y, label="Line")
-
-    for point in nodes:
-        if isinstance(point, PointNode):
-            plt.scatter(point.x, point.y, color='red')
-            plt.text(point.x - 0.08, point.y + 0.1, f'{point.name}', fontsize=12)
-
-    plt.legend()
+            kind = "Line"
+            xy = coords[[node.point1, node.point2]]
+        else:
+            continue
+        segments.append(xy)
+        colors.append(SHAPE_COLORS[kind])
+        kinds[kind] = None
+
+    if segments:
+        ax.add_collection(LineCollection(segments, colors=colors))
+        ax.autoscale()
+
+    points = [node for node in nodes if isinstance(node, PointNode)]
+    if points:
+        xy = coords[[p.index for p in points]]
+        plt.scatter(xy[:, 0], xy[:, 1], color='red')
+        for point, (x, y) in zip(points, xy):
+            plt.text(x - 0.08, y + 0.1, f'{point.name}', fontsize=12)
+
+    plt.legend(handles=[
+        Line2D([], [], color=SHAPE_COLORS[kind], label=kind) for kind in kinds
+    ])
     plt.xlabel("X")
     plt.ylabel("Y")
     plt.grid(True)
+    ax.xaxis.set_major_locator(MaxNLocator(5))
+    ax.yaxis.set_major_locator(MaxNLocator(5))
+    ax.minorticks_off()
     plt.show()
 
 
@@ -224,4 +311,4 @@ tokens = lexer.tokenize()
 print(tokens)
 parser = Parser(tokens)
 nodes = parser.parse()
-draw(nodes)
+draw(nodes, parser.coords)